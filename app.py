@@ -50,6 +50,9 @@ if file_upload is not None:
 
     # ---------------------- Data Pre-processing --------------------------------------
     df = pre_process_data(df)
+    unparsed = {col: n for col, n in df.attrs.get("parse_failures", {}).items() if n}
+    if unparsed:
+        st.sidebar.warning("Unparsed values: " + ", ".join(f"{col} ({n})" for col, n in unparsed.items()))
 
     year_list = list(set(df[df["Year"] != 0]["Year"].values))
     year_list.sort()
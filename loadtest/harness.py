@@ -0,0 +1,282 @@
+"""
+Load-test harness for the dashboard rerun latency.
+
+Drives N concurrent simulated sessions through the real ``app.py`` using Streamlit's
+testing API (``AppTest``). Every session uploads a generated inventory export, changes
+a filter and visits every page. The moverdb and newsfilter endpoints are answered by a
+local HTTP stand-in, so no network access or news API key is needed.
+
+Each (dataset size, session count) cell runs in its own process so the peak RSS is
+reported per cell. Latency is the wall time of ``AppTest.run()``, i.e. the script rerun
+plus the small overhead of the testing API.
+
+Usage, from the project directory:
+
+    python loadtest/harness.py --rows 1000 10000 50000 --sessions 1 4 16
+"""
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(PROJECT_DIR, "app.py")
+
+# Hosts the app talks to, rewritten to the local stand-in
+REMOTE_HOSTS = ["https://moverdb.com", "https://api.newsfilter.io"]
+
+PAGES = ["Overview", "Sales & Costs", "Inventory In vs. Out", "Sales' Ports", "News"]
+MENU_KEY = "loadtest_menu"
+
+# ----------------------------------- Test Data ---------------------------------------
+
+
+def generate_inventory_csv(rows: int, seed=0):
+    """Build an inventory export shaped like the real uploads, as CSV bytes."""
+    rng = random.Random(seed)
+    locations = ["Los Angeles", "Oakland", "Seattle", "Houston", "Savannah", "Chicago"]
+    depots = [f"DEPOT-{i:02d}" for i in range(12)]
+    sizes = ["20FT", "40FT", "40HC", "45HC"]
+    statuses = ["SOLD", "SELL", "PKUP", "HOLD", "REPAIR"]
+    start = datetime(2020, 1, 1)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["Unit #", "Location", "Depot", "Size", "Status", "Gate In", "Gate Out",
+                     "Value", "Sale Price", "Repair Cost", "Storage Cost", "Purchase Cost"])
+    for i in range(rows):
+        gate_in = start + timedelta(days=rng.randrange(5 * 365))
+        status = rng.choice(statuses)
+        gate_out = ""
+        sale_price = ""
+        if status in ("SOLD", "PKUP"):
+            gate_out = (gate_in + timedelta(days=rng.randrange(1, 200))).strftime("%m/%d/%Y")
+            sale_price = f"${rng.uniform(1500, 6000):,.2f}"
+        writer.writerow([f"UNIT{i:07d}", rng.choice(locations), rng.choice(depots), rng.choice(sizes),
+                         status, gate_in.strftime("%m/%d/%Y"), gate_out,
+                         f"${rng.uniform(1000, 5000):,.2f}", sale_price,
+                         f"${rng.uniform(0, 800):,.2f}" if status == "REPAIR" else "",
+                         f"${rng.uniform(10, 300):,.2f}", f"${rng.uniform(900, 4000):,.2f}"])
+    return buffer.getvalue().encode("utf-8")
+
+
+# ----------------------------------- Stand-ins ---------------------------------------
+
+MOVERDB_PORTS = ["China (Shanghai)", "Japan (Tokyo)", "Germany (Hamburg)", "Brazil (Santos)",
+                 "India (Mumbai)", "Australia (Sydney)", "Netherlands (Rotterdam)", "Chile (Valparaiso)"]
+
+
+def moverdb_page():
+    rng = random.Random(1)
+    rows = "".join(
+        f"<tr><td>{port}</td><td>${rng.randrange(3000, 12000):,}</td><td>${rng.randrange(4000, 15000):,}</td></tr>"
+        for port in MOVERDB_PORTS
+    )
+    return (f'<html><body><table id="tablepress-29">'
+            f'<tr class="row-1"><th>Origin Country (Port/City)</th><th>20FT</th><th>40FT</th></tr>'
+            f'{rows}</table></body></html>')
+
+
+def newsfilter_response():
+    today = datetime.now().strftime("%Y-%m-%d")
+    return {"articles": [{"title": f"Container market update {i}",
+                          "description": "Leasing rates and depot volumes for the week.",
+                          "source": {"name": "Stand-in Wire"},
+                          "publishedAt": today,
+                          "sourceUrl": "./"} for i in range(10)]}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def _send(self, body: bytes, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send(moverdb_page().encode("utf-8"), "text/html")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send(json.dumps(newsfilter_response()).encode("utf-8"), "application/json")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def patch_environment(local_url):
+    """Point the app's outbound requests at the stand-in and replace the custom menu."""
+    import requests
+    import streamlit as st
+    import streamlit_option_menu
+    from streamlit.runtime.secrets import Secrets
+
+    session_request = requests.Session.request
+
+    def request(self, method, url, *args, **kwargs):
+        for host in REMOTE_HOSTS:
+            if url.startswith(host):
+                url = local_url + url[len(host):]
+        return session_request(self, method, url, *args, **kwargs)
+
+    requests.Session.request = request
+
+    # option_menu is a custom component the testing API cannot click, so the stand-in
+    # renders a radio that the sessions can switch like any other widget.
+    def option_menu(menu_title, options, default_index=0, **kwargs):
+        return st.radio(menu_title or "Menu", options, index=default_index, key=MENU_KEY,
+                        horizontal=True, label_visibility="collapsed")
+
+    streamlit_option_menu.option_menu = option_menu
+
+    # Secrets are set once for the process; AppTest swaps st.secrets per run otherwise,
+    # which is not safe with several sessions running at the same time.
+    secrets = Secrets()
+    secrets._secrets = {"news_api_key": {"key": "loadtest"}}
+    st.secrets = secrets
+
+
+# ----------------------------------- Sessions ----------------------------------------
+
+
+def run_session(data: bytes, timeout, barrier, latencies: list, errors: list):
+    from streamlit.testing.v1 import AppTest
+
+    def rerun(at, step):
+        started = time.perf_counter()
+        at.run(timeout=timeout)
+        latencies.append((step, time.perf_counter() - started))
+        if at.exception:
+            errors.append(f"{step}: {at.exception[0].message}")
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    barrier.wait()
+    try:
+        rerun(at, "start")
+        at.sidebar.file_uploader[0].set_value(("inventory.csv", data, "text/csv"))
+        rerun(at, "upload")
+        location = at.sidebar.multiselect[0]
+        location.set_value(sorted(location.options)[:2])
+        rerun(at, "filter")
+        for page in PAGES[1:]:
+            at.radio(key=MENU_KEY).set_value(page)
+            rerun(at, "page")
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+
+
+def percentile(values: list, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_cell(rows: int, sessions: int, timeout):
+    os.chdir(PROJECT_DIR)
+    sys.path.insert(0, PROJECT_DIR)
+    server, local_url = start_stand_in_server()
+    patch_environment(local_url)
+
+    data = generate_inventory_csv(rows)
+    barrier = threading.Barrier(sessions)
+    latencies, errors = [], []
+    threads = [threading.Thread(target=run_session, args=(data, timeout, barrier, latencies, errors))
+               for _ in range(sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    # The first run only renders the empty app, so it is left out of the percentiles
+    seconds = [latency for step, latency in latencies if step != "start"]
+    return {"rows": rows, "sessions": sessions, "failed": False, "reruns": len(seconds),
+            "p50": percentile(seconds, 50), "p95": percentile(seconds, 95), "p99": percentile(seconds, 99),
+            "upload_p50": percentile([s for step, s in latencies if step == "upload"], 50),
+            "peak_rss_mb": peak_rss_mb(), "elapsed": elapsed, "errors": errors}
+
+
+# ----------------------------------- Report ------------------------------------------
+
+
+def print_report(results: list):
+    header = f"{'rows':>8} {'sessions':>8} {'reruns':>6} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} " \
+             f"{'upload p50 s':>12} {'peak RSS MB':>11} {'errors':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if r["failed"]:
+            print(f"{r['rows']:>8} {r['sessions']:>8}  failed")
+            continue
+        print(f"{r['rows']:>8} {r['sessions']:>8} {r['reruns']:>6} {r['p50']:>8.3f} {r['p95']:>8.3f} "
+              f"{r['p99']:>8.3f} {r['upload_p50']:>12.3f} {r['peak_rss_mb']:>11.1f} {len(r['errors']):>6}")
+    for r in results:
+        for error in r["errors"][:3]:
+            print(f"[{r['rows']} rows / {r['sessions']} sessions] {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent session load test for the dashboard.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="dataset sizes to upload")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16],
+                        help="numbers of concurrent sessions")
+    parser.add_argument("--timeout", type=float, default=300, help="per rerun timeout in seconds")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--cell", type=int, nargs=2, metavar=("ROWS", "SESSIONS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cell:
+        print(json.dumps(run_cell(*args.cell, timeout=args.timeout)))
+        return
+
+    results = []
+    for rows in args.rows:
+        for sessions in args.sessions:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--cell", str(rows), str(sessions),
+                                  "--timeout", str(args.timeout)],
+                                 capture_output=True, text=True)
+            try:
+                results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+            except (IndexError, ValueError):
+                results.append({"rows": rows, "sessions": sessions, "failed": True,
+                                "errors": [f"cell exited with code {out.returncode}"]})
+                print(f"failed: {rows} rows / {sessions} sessions (exit code {out.returncode})", file=sys.stderr)
+                print(out.stderr, file=sys.stderr)
+                continue
+            print(f"done: {rows} rows / {sessions} sessions", file=sys.stderr)
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()